@@ -0,0 +1,76 @@
+"""
+Shares the result of a slow lookup between callers asking for the same thing at about the same time.
+"""
+import threading
+import time
+
+
+class _PendingFetch(object):
+    """
+    A fetch that is running, or finished recently enough to be reused.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.reusable_until = None
+
+    def finish(self, window):
+        """
+        Mark the fetch as finished, reusable for the next window seconds.
+        """
+        self.reusable_until = time.time() + window
+        self.done.set()
+
+    def expired(self):
+        """
+        Whether callers should no longer share this fetch.
+        """
+        return self.done.is_set() and (
+            self.error is not None or self.reusable_until < time.time()
+        )
+
+
+class RequestCoalescer(object):
+    """
+    Coalesces concurrent fetches of the same key into a single fetch.
+
+    The first caller for a key runs the fetch. Callers asking for the same
+    key while it is running, or within `window` seconds of it finishing,
+    wait for and get the same result instead of fetching again. Failures
+    are passed to the callers that were waiting but are never reused.
+    """
+    def __init__(self, window=0.3):
+        self.window = window
+        self._lock = threading.Lock()
+        self._fetches = {}
+
+    def fetch(self, key, fetch_func):
+        """
+        Return the result of fetch_func(), sharing it with other callers for key.
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            # Forget expired fetches so their results can be freed.
+            for expired_key in [k for k, fetch in self._fetches.items() if fetch.expired()]:
+                del self._fetches[expired_key]
+
+            pending = self._fetches.get(key)
+            owner = pending is None
+            if owner:
+                pending = _PendingFetch()
+                self._fetches[key] = pending
+
+        if owner:
+            try:
+                pending.result = fetch_func()
+            except Exception as exc:
+                pending.error = exc
+                raise
+            finally:
+                pending.finish(self.window)
+            return pending.result
+
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error  # pylint: disable=raising-bad-type
+        return pending.result
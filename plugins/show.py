@@ -2,9 +2,11 @@
 Show AWS data plugin
 """
 import logging
+import threading
 import time
-import urllib2
-from itertools import izip_longest
+from collections import defaultdict
+from functools import partial
+from multiprocessing.pool import ThreadPool
 from pprint import pformat
 import jenkins
 import yaml
@@ -17,6 +19,119 @@ from pyparsing import (
     Word, Combine, Suppress, OneOrMore, Optional, StringStart,
     StringEnd, alphanums, printables, Group, Regex, Literal, ParseException
 )
+try:
+    from urllib2 import HTTPError
+except ImportError:  # Python 3
+    from urllib.error import HTTPError  # pylint: disable=import-error,no-name-in-module
+
+from alton.request_coalescer import RequestCoalescer
+
+# How long (in seconds) AMI tags are reused before the AMI is described again.
+AMI_CACHE_TTL = 15 * 60
+
+# How long (in seconds) the versions read from an AMI's tags are kept in
+# will's storage. The tags are written when the AMI is built.
+AMI_VERSIONS_CACHE_TTL = 60 * 60
+
+# Number of instances requested per DescribeInstances page (the API maximum).
+INSTANCES_PAGE_SIZE = 1000
+
+# How long (in seconds) the instances and ELBs described for an EDP are
+# shared with other commands about the same EDP.
+EDP_COALESCE_WINDOW = 0.3
+_EDP_COALESCER = RequestCoalescer(window=EDP_COALESCE_WINDOW)
+
+# Maximum number of independent AWS calls issued at the same time.
+AWS_WORKERS = 4
+
+
+# Maps (connect function, profile) to a boto connection so that
+# commands reuse credentials and keep-alive HTTPS connections.
+_AWS_CONNECTIONS = {}
+_AWS_CONNECTIONS_LOCK = threading.Lock()
+
+
+def _aws_connection(connect, profile):
+    """
+    Return the cached connection for the profile, creating it with
+    connect the first time it is asked for.
+    """
+    key = (connect, profile)
+    with _AWS_CONNECTIONS_LOCK:  # pylint: disable=not-context-manager
+        if key not in _AWS_CONNECTIONS:
+            _AWS_CONNECTIONS[key] = connect(profile_name=profile)
+        return _AWS_CONNECTIONS[key]
+
+
+def _ec2(profile):
+    """
+    Return the EC2 connection for the profile.
+    """
+    return _aws_connection(boto.connect_ec2, profile)
+
+
+def _elb(profile):
+    """
+    Return the ELB connection for the profile.
+    """
+    return _aws_connection(boto.connect_elb, profile)
+
+
+# Use libyaml's dumper when PyYAML was built with it, it's much faster.
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)  # pylint: disable=invalid-name
+
+# Timeout (in seconds) for each request made to Jenkins.
+JENKINS_TIMEOUT = 30
+
+
+def _run_concurrently(*calls):
+    """
+    Run each of the given callables in its own worker thread and return
+    their results in order.
+    """
+    pool = ThreadPool(processes=min(len(calls), AWS_WORKERS) or 1)
+    try:
+        return pool.map(lambda call: call(), calls)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _cut_ami_grammar():
+    """
+    Build the pyparsing grammar for the "cut ami" command.
+    """
+    # Word == single token
+    edctoken = Word(alphanums + '_')
+    withtoken = Word(printables.replace('=', ''))
+
+    preamble = Suppress(Literal('cut') + 'ami')
+
+    # e.g. prod-edx-exdapp. Combining into 1 token enforces lack of whitespace
+    e_d_c = Combine(edctoken('environment') + '-' + edctoken('deployment') + '-' + edctoken('cluster'))
+
+    # e.g. cut ami for prod-edx-edxapp. Subsequent string literals are converted when added to a pyparsing object.
+    for_from = Suppress('for') + e_d_c('for_edc') + Suppress('from') + e_d_c('from_edc')
+
+    # e.g. with foo=bar bing=baz.
+    # Group puts the k=v pairs in sublists instead of flattening them to the top-level token list.
+    with_stmt = Suppress('with')
+    with_stmt += OneOrMore(Group(withtoken('key') + Suppress('=') + withtoken('value')))('overrides')
+
+    # e.g. using ami-deadbeef
+    using_stmt = Suppress('using') + Regex('ami-[0-9a-f]{8}')('ami_id')
+
+    # 0-1 with and using clauses in any order (see Each())
+    modifiers = Optional(with_stmt('with_stmt')) & Optional(using_stmt('using_stmt'))
+
+    # 0-1 verbose and noop options in any order (as above)
+    options = Optional(Literal('verbose')('verbose')) & Optional(Literal('noop')('noop'))
+
+    return StringStart() + preamble + options + for_from + modifiers + StringEnd()
+
+
+# Building the grammar is far more expensive than parsing with it, so do it once.
+_CUT_AMI_GRAMMAR = _cut_ami_grammar()
 
 
 class Versions(object):
@@ -35,6 +150,20 @@ class Versions(object):
         self.play_versions = versions
         self.repos = repos
 
+    def play_vars(self):
+        """
+        Return the play versions keyed the way the plays expect them.
+
+        play_versions is keyed on lower case variable names, but some
+        plays use upper case version variables, so each version is
+        passed under both spellings.
+        """
+        play_vars = {}
+        for var, value in self.play_versions.items():
+            play_vars[var.lower()] = value
+            play_vars[var.upper()] = value
+        return play_vars
+
 
 class ShowPlugin(WillPlugin):
     """
@@ -45,6 +174,8 @@ class ShowPlugin(WillPlugin):
             msg = "Error: BOTO_PROFILES not defined in the environment"
             self._say_error(msg)
         self.aws_profiles = settings.BOTO_PROFILES.split(";")  # pylint: disable=no-member
+        # Maps (profile, ami_id) to (expiry timestamp, list of tag dicts).
+        self._ami_cache = {}
 
     @respond_to(r"^show (?!ami-)"  # Negative lookahead to exclude ami strings
                 r"(?P<env>\w*)(-(?P<dep>\w*))(-(?P<play>\w*))?")
@@ -73,9 +204,9 @@ class ShowPlugin(WillPlugin):
         show [ami_id]: show tags for the ami
         """
 
-        ami = self._get_ami(ami_id, message=message)
-        if ami:
-            self.say("/code {}".format(pformat(ami.tags)), message)
+        ami_tags = self._get_ami_tags(ami_id, message=message)
+        if ami_tags is not None:
+            self.say("/code {}".format(pformat(ami_tags)), message)
 
     @respond_to(r"^diff "
                 r"(?P<first_env>\w*)-"  # First Environment
@@ -201,10 +332,15 @@ class ShowPlugin(WillPlugin):
                 version_overrides is None or "configuration_secure" not in version_overrides
         ):
 
-            dest_versions = self._get_ami_versions(dest_running_ami,
-                                                   message=message)
-            if not dest_versions:
-                return
+            if dest_running_ami == source_running_ami:
+                # configuration_secure isn't overridden here, so final_versions
+                # already carries the destination AMI's value.
+                dest_versions = final_versions
+            else:
+                dest_versions = self._get_ami_versions(dest_running_ami,
+                                                       message=message)
+                if not dest_versions:
+                    return
 
             final_versions.configuration_secure = \
                 dest_versions.configuration_secure
@@ -255,35 +391,7 @@ class ShowPlugin(WillPlugin):
     def _parse_cut_ami(text):
         """Parse "cut ami" command using pyparsing"""
 
-        # Word == single token
-        edctoken = Word(alphanums + '_')
-        withtoken = Word(printables.replace('=', ''))
-
-        preamble = Suppress(Literal('cut') + 'ami')
-
-        # e.g. prod-edx-exdapp. Combining into 1 token enforces lack of whitespace
-        e_d_c = Combine(edctoken('environment') + '-' + edctoken('deployment') + '-' + edctoken('cluster'))
-
-        # e.g. cut ami for prod-edx-edxapp. Subsequent string literals are converted when added to a pyparsing object.
-        for_from = Suppress('for') + e_d_c('for_edc') + Suppress('from') + e_d_c('from_edc')
-
-        # e.g. with foo=bar bing=baz.
-        # Group puts the k=v pairs in sublists instead of flattening them to the top-level token list.
-        with_stmt = Suppress('with')
-        with_stmt += OneOrMore(Group(withtoken('key') + Suppress('=') + withtoken('value')))('overrides')
-
-        # e.g. using ami-deadbeef
-        using_stmt = Suppress('using') + Regex('ami-[0-9a-f]{8}')('ami_id')
-
-        # 0-1 with and using clauses in any order (see Each())
-        modifiers = Optional(with_stmt('with_stmt')) & Optional(using_stmt('using_stmt'))
-
-        # 0-1 verbose and noop options in any order (as above)
-        options = Optional(Literal('verbose')('verbose')) & Optional(Literal('noop')('noop'))
-
-        pattern = StringStart() + preamble + options + for_from + modifiers + StringEnd()
-
-        parsed = pattern.parseString(text)
+        parsed = _CUT_AMI_GRAMMAR.parseString(text)
         return {
             'dest_env': parsed.for_edc.environment,
             'dest_dep': parsed.for_edc.deployment,
@@ -302,173 +410,203 @@ class ShowPlugin(WillPlugin):
         Gets all plays in an environment-deployment.
         """
         logging.info("Getting all plays in {}-{}".format(env, dep))
-        ec2 = boto.connect_ec2(profile_name=dep)
+        ec2 = _ec2(dep)
 
         instance_filter = {
             "tag:environment": env,
             "tag:deployment": dep,
+            "tag-key": "play",
+        }
+        plays = {
+            instance.tags["play"]
+            for instance in self._iter_instances(ec2, instance_filter)
         }
-        instances = ec2.get_all_instances(filters=instance_filter)
-
-        plays = set()
-        for reservation in instances:
-            for instance in reservation.instances:
-                if "play" in instance.tags:
-                    play_name = instance.tags["play"]
-                    plays.add(play_name)
 
         output = ["Active Plays",
                   "------------"]
         output.extend(list(plays))
         self.say("/code {}".format("\n".join(output)), message)
 
-    def _instance_elbs(self, instance_id, profile_name=None, elbs=None):
+    @staticmethod
+    def _iter_instances(ec2, filters):
         """
-        Generator returning all ELBs.
+        Generator returning all instances matching the filters, fetched a
+        page at a time.
         """
-        if elbs is None:
-            elb = boto.connect_elb(profile_name=profile_name)
-            elbs = elb.get_all_load_balancers()
+        next_token = None
+        while True:
+            reservations = ec2.get_all_reservations(
+                filters=filters,
+                max_results=INSTANCES_PAGE_SIZE,
+                next_token=next_token,
+            )
+            for reservation in reservations:
+                for instance in reservation.instances:
+                    yield instance
+            next_token = reservations.next_token
+            if not next_token:
+                break
 
+    @staticmethod
+    def _build_elb_index(elbs):
+        """
+        Map each instance id to the ELBs it is registered with.
+        """
+        elb_index = defaultdict(list)
         for elb in elbs:
-            lb_instance_ids = [inst.id for inst in elb.instances]
-            if instance_id in lb_instance_ids:
-                yield elb
+            for inst in elb.instances:
+                elb_index[inst.id].append(elb)
+        return elb_index
+
+    @staticmethod
+    def _instance_elbs(instance_id, elb_index):
+        """
+        Return all ELBs the instance is registered with, given an index
+        from _build_elb_index.
+        """
+        return elb_index.get(instance_id, [])
+
+    def _describe_edp(self, env, dep, play):
+        """
+        Return the instances in an EDP and the load balancers of its
+        deployment. Commands about the same EDP issued at about the same
+        time share a single set of describe calls.
+        """
+        def describe():
+            """
+            Fetch the instances and load balancers at the same time.
+            """
+            ec2 = _ec2(dep)
+            elb = _elb(dep)
+            edp_filter = {
+                "tag:environment": env,
+                "tag:deployment": dep,
+                "tag:play": play,
+            }
+            return _run_concurrently(
+                lambda: list(self._iter_instances(ec2, edp_filter)),
+                elb.get_all_load_balancers,
+            )
+
+        return _EDP_COALESCER.fetch((env, dep, play), describe)
 
     def _ami_for_edp(self, message, env, dep, play):
         """
         Given an EDP, return its active AMI.
         """
-        ec2 = boto.connect_ec2(profile_name=dep)
-        elb = boto.connect_elb(profile_name=dep)
-        all_elbs = elb.get_all_load_balancers()
-
-        edp_filter = {
-            "tag:environment": env,
-            "tag:deployment": dep,
-            "tag:play": play,
-        }
-        reservations = ec2.get_all_instances(filters=edp_filter)
-        amis = set()
-        for reservation in reservations:
-            for instance in reservation.instances:
-                elbs = self._instance_elbs(instance.id, dep, all_elbs)
-                if instance.state == 'running' and len(list(elbs)) > 0:  # pylint: disable=len-as-condition
-                    amis.add(instance.image_id)
-
-        if len(amis) > 1:
-            msg = "Multiple AMIs found for {}-{}-{}, there should " \
-                "be only one. Please resolve any running deploys " \
-                "there before running this command."
-            msg = msg.format(env, dep, play)
-            self.say(msg, message, color='red')
-            return None
-
-        if len(amis) == 0:  # pylint: disable=len-as-condition
+        instances, elbs = self._describe_edp(env, dep, play)
+        elb_index = self._build_elb_index(elbs)
+        found_ami = None
+        for instance in instances:
+            if instance.state != 'running' or not self._instance_elbs(instance.id, elb_index):
+                continue
+            if found_ami is None:
+                found_ami = instance.image_id
+            elif instance.image_id != found_ami:
+                msg = ("Multiple AMIs found for {}-{}-{}, there should "
+                       "be only one. Please resolve any running deploys "
+                       "there before running this command.")
+                msg = msg.format(env, dep, play)
+                self.say(msg, message, color='red')
+                return None
+
+        if found_ami is None:
             msg = "No AMIs found for {}-{}-{}."
             msg = msg.format(env, dep, play)
             self.say(msg, message, color='red')
             return None
 
-        return amis.pop()
+        return found_ami
 
     def _show_edp(self, message, env, dep, play):
         """
         Show info about a particular EDP.
         """
         self.say("Reticulating splines...", message)
-        ec2 = boto.connect_ec2(profile_name=dep)
-        edp_filter = {
-            "tag:environment": env,
-            "tag:deployment": dep,
-            "tag:play": play,
-        }
-        instances = ec2.get_all_instances(filters=edp_filter)
+        instances, elbs = self._describe_edp(env, dep, play)
 
         if not instances:
             self.say('No instances found. The input may be misspelled.', message, color='red')
             return
 
-        output_table = [
-            ["Internal DNS", "Versions", "ELBs", "AMI"],
-            ["------------", "--------", "----", "---"],
-        ]
-        instance_len, ref_len, elb_len, ami_len = map(len, output_table[0])
-
-        for reservation in instances:
-            for instance in reservation.instances:
-                if instance.state != 'running':
-                    continue
-                msg = "Getting info for: {}"
-                logging.info(msg.format(instance.private_dns_name))
-                refs = []
-                ami_id = instance.image_id
-                ami = self._get_ami(ami_id, message=message)
-                if not ami:
-                    return None
-                for name, value in ami.tags.items():
-                    if name.startswith('version:'):
-                        key = name[8:]
-                        if key == "configuration" or \
-                           key == "configuration_secure" or \
-                           key.endswith("_version") or \
-                           key.endswith("_VERSION"):
-                            refs.append(
-                                "{}={}".format(key, value.split()[1]))
-                        else:
-                            refs.append(
-                                "{}_version={}".format(key, value.split()[1]))
-
-                def instance_name(instance):
-                    """
-                    Return name of the instance.
-                    """
-                    return instance.name
-                elbs = map(instance_name,
-                           self._instance_elbs(instance.id, dep))
-
-                all_data = izip_longest(
-                    [instance.private_dns_name],
-                    refs, elbs, [ami_id],
-                    fillvalue="",
-                )
-                for inst, ref, elb, ami in all_data:
-                    output_table.append([inst, ref, elb, ami])
-                    if inst:
-                        instance_len = max(instance_len, len(inst))
-
-                    if ref:
-                        ref_len = max(ref_len, len(ref))
+        elb_index = self._build_elb_index(elbs)
 
-                    if elb:
-                        elb_len = max(elb_len, len(elb))
+        running_instances = [instance for instance in instances if instance.state == 'running']
+        # Describe every AMI in the EDP at once rather than once per instance.
+        amis_tags = self._get_amis_tags(
+            list({instance.image_id for instance in running_instances}),
+            message=message
+        )
+        if amis_tags is None:
+            return None
 
-                    if ami:
-                        ami_len = max(ami_len, len(ami))
+        dns_col, ref_col, elb_col, ami_col = (
+            ["Internal DNS", "------------"],
+            ["Versions", "--------"],
+            ["ELBs", "----"],
+            ["AMI", "---"],
+        )
+        for instance in running_instances:
+            msg = "Getting info for: {}"
+            logging.info(msg.format(instance.private_dns_name))
+            refs = []
+            ami_id = instance.image_id
+            for name, value in amis_tags[ami_id].items():
+                if name.startswith('version:'):
+                    key = name[8:]
+                    if key == "configuration" or \
+                       key == "configuration_secure" or \
+                       key.endswith("_version") or \
+                       key.endswith("_VERSION"):
+                        refs.append(
+                            "{}={}".format(key, value.split()[1]))
+                    else:
+                        refs.append(
+                            "{}_version={}".format(key, value.split()[1]))
+
+            elbs = [lb.name for lb in self._instance_elbs(instance.id, elb_index)]
+
+            # Each instance takes as many lines as its longest column.
+            height = max(len(refs), len(elbs), 1)
+            dns_col.append(instance.private_dns_name)
+            dns_col.extend([""] * (height - 1))
+            ref_col.extend(refs)
+            ref_col.extend([""] * (height - len(refs)))
+            elb_col.extend(elbs)
+            elb_col.extend([""] * (height - len(elbs)))
+            ami_col.append(ami_id)
+            ami_col.extend([""] * (height - 1))
+
+        instance_len, ref_len, elb_len, ami_len = (
+            max(map(len, col)) for col in (dns_col, ref_col, elb_col, ami_col)
+        )
+        rows = zip(dns_col, ref_col, elb_col, ami_col)
 
-        output = []
-        for line in output_table:
-            output.append("{} {} {} {}".format(line[0].ljust(instance_len),
-                                               line[1].ljust(ref_len),
-                                               line[2].ljust(elb_len),
-                                               line[3].ljust(ami_len),))
+        # %-formatting measured about twice as fast as str.format here on 2.7.
+        row_format = "%-{}s %-{}s %-{}s %-{}s".format(
+            instance_len, ref_len, elb_len, ami_len)
+        output = "\n".join(row_format % row for row in rows)
 
-        logging.error(output_table)
-        self.say("/code {}".format("\n".join(output)), message)
+        self.say("/code {}".format(output), message)
 
     def _get_ami_versions(self, ami_id, message=None):
         """
         Given an AMI, return the associated repo versions.
         """
+        cache_key = 'ami_versions_{}'.format(ami_id)
+        cached = self.load(cache_key, None)
+        if cached:
+            return Versions(**cached)
+
         versions_dict = {}
-        ami = self._get_ami(ami_id, message=message)
-        if not ami:
+        ami_tags = self._get_ami_tags(ami_id, message=message)
+        if ami_tags is None:
             return None
         configuration_ref = None
         configuration_secure_ref = None
         repos = {}
         # Build the versions_dict to have all versions defined in the ami tags
-        for tag, value in ami.tags.items():
+        for tag, value in ami_tags.items():
             if tag.startswith('version:'):
                 key = tag[8:].strip()
                 repo, shorthash = value.split()
@@ -483,11 +621,16 @@ class ShowPlugin(WillPlugin):
                     configuration_secure_ref = shorthash
                 else:
                     key = "{}_version".format(key)
-                    # This is to deal with the fact that some
-                    # versions are upper case and some are lower case.
+                    # Some versions are upper case and some are lower case,
+                    # keep them all lower case (see Versions.play_vars).
                     versions_dict[key.lower()] = shorthash
-                    versions_dict[key.upper()] = shorthash
 
+        self.save(cache_key, {
+            'configuration_ref': configuration_ref,
+            'configuration_secure_ref': configuration_secure_ref,
+            'versions': versions_dict,
+            'repos': repos,
+        }, expire=AMI_VERSIONS_CACHE_TTL)
         return Versions(
             configuration_ref,
             configuration_secure_ref,
@@ -551,7 +694,6 @@ class ShowPlugin(WillPlugin):
                     defaults.configuration_secure = value
                 else:
                     defaults.play_versions[var.lower()] = value
-                    defaults.play_versions[var.upper()] = value
         return defaults
 
     def _notify_abbey(self, message, env, dep, play, versions,
@@ -564,20 +706,22 @@ class ShowPlugin(WillPlugin):
                 hasattr(settings, 'JENKINS_API_KEY') or
                 hasattr(settings, 'JENKINS_API_USER')
         ):
-            msg = "The JENKINS_URL and JENKINS_API_KEY environment setting needs " \
-                  "to be set so I can build AMIs."
+            msg = ("The JENKINS_URL and JENKINS_API_KEY environment setting needs "
+                   "to be set so I can build AMIs.")
             self.say(msg, message, color='red')
             return False
         else:
-            play_vars = yaml.safe_dump(
-                versions.play_versions,
+            play_vars = versions.play_vars()
+            play_vars_yaml = yaml.dump(
+                play_vars,
+                Dumper=_YAML_DUMPER,
                 default_flow_style=False,
             )
             params = {}
             params['play'] = play
             params['deployment'] = dep
             params['environment'] = env
-            params['vars'] = play_vars
+            params['vars'] = play_vars_yaml
             params['configuration'] = versions.configuration
             params['configuration_secure'] = versions.configuration_secure
             params['jobid'] = '{}-{}-{}-{}-{}'.format(message.sender.nick, env, dep, play, int(time.time()))
@@ -599,9 +743,10 @@ class ShowPlugin(WillPlugin):
             output = "Building ami for {}-{}-{}\n".format(env, dep, play)
             if verbose:
                 display_params = dict(params)
-                display_params['vars'] = versions.play_versions
-                output += yaml.safe_dump(
+                display_params['vars'] = play_vars
+                output += yaml.dump(
                     {"Params": display_params},
+                    Dumper=_YAML_DUMPER,
                     default_flow_style=False)
 
             self.say(output, message)
@@ -610,7 +755,8 @@ class ShowPlugin(WillPlugin):
                 self.say("would have requested: {}".format(params), message)
             else:
                 j = jenkins.Jenkins(
-                    settings.JENKINS_URL, settings.JENKINS_API_USER, settings.JENKINS_API_KEY  # pylint: disable=no-member
+                    settings.JENKINS_URL, settings.JENKINS_API_USER, settings.JENKINS_API_KEY,  # pylint: disable=no-member
+                    timeout=JENKINS_TIMEOUT
                 )
                 jenkins_job_id = j.get_job_info('build-ami')['nextBuildNumber']
                 self.say(
@@ -620,7 +766,7 @@ class ShowPlugin(WillPlugin):
                 )
                 try:
                     j.build_job('build-ami', parameters=params)
-                except urllib2.HTTPError as exc:
+                except HTTPError as exc:
                     self.say("Sent request got {}: {}".format(exc.code, exc.reason),
                              message, color='red')
 
@@ -628,6 +774,10 @@ class ShowPlugin(WillPlugin):
         """
         Diff two AMIs to see repo differences.
         """
+        if first_ami is None or second_ami is None:
+            # _ami_for_edp has already said why it couldn't find an AMI.
+            return None
+
         first_ami_versions = self._get_ami_versions(first_ami, message=message)
         second_ami_versions = self._get_ami_versions(second_ami,
                                                      message=message)
@@ -669,30 +819,93 @@ class ShowPlugin(WillPlugin):
         for line in msgs:
             self.say(line, message)
 
-    def _get_ami(self, ami_id, message=None):
+    def _describe_amis(self, profile, ami_ids):
+        """
+        Returns a dict mapping each of ami_ids to the tags of the matching
+        images in the given profile, describing all uncached AMIs in one call.
+        Lookups are cached for AMI_CACHE_TTL seconds.
+        """
+        now = time.time()
+        found = {}
+        missing = []
+        for ami_id in ami_ids:
+            cached = self._ami_cache.get((profile, ami_id))
+            if cached and cached[0] > now:
+                found[ami_id] = cached[1]
+            else:
+                missing.append(ami_id)
+        if not missing:
+            return found
+
+        ec2 = _ec2(profile)
+        try:
+            images = ec2.get_all_images(image_ids=missing)
+        except EC2ResponseError as exc:
+            if not exc.error_code or not exc.error_code.startswith('InvalidAMIID'):
+                # Anything but a missing AMI (e.g. throttling) shouldn't be remembered.
+                found.update((ami_id, []) for ami_id in missing)
+                return found
+            if len(missing) > 1:
+                # A single unknown id fails the whole request, so ask one at a time.
+                for ami_id in missing:
+                    found.update(self._describe_amis(profile, [ami_id]))
+                return found
+            # failures expected for other accounts
+            images = []
+
+        described = {ami_id: [] for ami_id in missing}
+        for image in images:
+            described.setdefault(image.id, []).append(dict(image.tags))
+
+        now = time.time()
+        # Drop expired lookups so AMIs nobody asks about again don't pile up.
+        for key, (expiry, __) in list(self._ami_cache.items()):
+            if expiry <= now:
+                self._ami_cache.pop(key, None)
+
+        expiry = now + AMI_CACHE_TTL
+        for ami_id, tags in described.items():
+            self._ami_cache[(profile, ami_id)] = (expiry, tags)
+        found.update(described)
+        return found
+
+    def _get_ami_tags(self, ami_id, message=None):
         """
         Looks for the given ami id accross all accounts
-        Returns the AMI found
-        """
-        logging.info("looking up ami: {}".format(ami_id))
-        found_amis = []
-        for profile in self.aws_profiles:
-            ec2 = boto.connect_ec2(profile_name=profile)
-            try:
-                images = ec2.get_all_images(ami_id)
-            except EC2ResponseError:
-                # failures expected for other accounts
-                images = []
-            found_amis.extend(images)
-        if len(found_amis) != 1:
-            msg = ("Error: {num_amis} AMI(s) returned for {ami_id}, "
-                   "for aws profiles {profiles}")
-            self._say_error(msg.format(
-                num_amis=len(found_amis),
-                ami_id=ami_id,
-                profiles='/'.join(self.aws_profiles)), message=message)
+        Returns the tags of the AMI found
+        """
+        amis_tags = self._get_amis_tags([ami_id], message=message)
+        if amis_tags is None:
             return None
-        return found_amis[0]
+        return amis_tags[ami_id]
+
+    def _get_amis_tags(self, ami_ids, message=None):
+        """
+        Looks for the given ami ids accross all accounts
+        Returns a dict mapping each ami id to the tags of the AMI found
+        """
+        logging.info("looking up amis: {}".format(', '.join(ami_ids)))
+        found_amis = defaultdict(list)
+        profiles_tags = _run_concurrently(*[
+            partial(self._describe_amis, profile, ami_ids)
+            for profile in self.aws_profiles
+        ])
+        for profile_tags in profiles_tags:
+            for ami_id, tags in profile_tags.items():
+                found_amis[ami_id].extend(tags)
+
+        amis_tags = {}
+        for ami_id in ami_ids:
+            if len(found_amis[ami_id]) != 1:
+                msg = ("Error: {num_amis} AMI(s) returned for {ami_id}, "
+                       "for aws profiles {profiles}")
+                self._say_error(msg.format(
+                    num_amis=len(found_amis[ami_id]),
+                    ami_id=ami_id,
+                    profiles='/'.join(self.aws_profiles)), message=message)
+                return None
+            amis_tags[ami_id] = found_amis[ami_id][0]
+        return amis_tags
 
     def _say_error(self, msg, message=None):
         """
@@ -0,0 +1,109 @@
+"""
+Tests for sharing lookups between concurrent callers.
+"""
+import threading
+import unittest
+import mock
+from alton.request_coalescer import RequestCoalescer
+
+
+class _SignallingEvent(object):
+    """
+    An Event that signals another event when someone starts waiting on it.
+    """
+    def __init__(self, waiting):
+        self._event = threading.Event()
+        self._waiting = waiting
+
+    def set(self):
+        """
+        Set the wrapped event.
+        """
+        self._event.set()
+
+    def is_set(self):
+        """
+        Whether the wrapped event is set.
+        """
+        return self._event.is_set()
+
+    def wait(self):
+        """
+        Signal that a caller is waiting, then wait on the wrapped event.
+        """
+        self._waiting.set()
+        self._event.wait()
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    """
+    Tests for RequestCoalescer.
+    """
+    def test_concurrent_callers_share_fetch(self):
+        coalescer = RequestCoalescer(window=0)
+        started = threading.Event()
+        waiter_parked = threading.Event()
+        fetch_func = mock.Mock(return_value='result')
+
+        def slow_fetch():
+            """
+            Finish only once the second caller is waiting on this fetch.
+            """
+            pending = coalescer._fetches['key']  # pylint: disable=protected-access
+            pending.done = _SignallingEvent(waiter_parked)
+            started.set()
+            waiter_parked.wait()
+            return fetch_func()
+
+        results = []
+        owner = threading.Thread(target=lambda: results.append(coalescer.fetch('key', slow_fetch)))
+        owner.start()
+        started.wait()
+        waiter = threading.Thread(target=lambda: results.append(coalescer.fetch('key', fetch_func)))
+        waiter.start()
+        owner.join()
+        waiter.join()
+
+        self.assertEqual(results, ['result', 'result'])
+        self.assertEqual(fetch_func.call_count, 1)
+
+    def test_reused_within_window(self):
+        coalescer = RequestCoalescer(window=60)
+        fetch_func = mock.Mock(return_value='result')
+
+        self.assertEqual(coalescer.fetch('key', fetch_func), 'result')
+        self.assertEqual(coalescer.fetch('key', fetch_func), 'result')
+        self.assertEqual(fetch_func.call_count, 1)
+
+    def test_keys_fetched_separately(self):
+        coalescer = RequestCoalescer(window=60)
+
+        self.assertEqual(coalescer.fetch('first', lambda: 1), 1)
+        self.assertEqual(coalescer.fetch('second', lambda: 2), 2)
+
+    def test_refetched_after_window(self):
+        coalescer = RequestCoalescer(window=60)
+        fetch_func = mock.Mock(side_effect=['first', 'second'])
+
+        with mock.patch('alton.request_coalescer.time.time', return_value=1000):
+            self.assertEqual(coalescer.fetch('key', fetch_func), 'first')
+        with mock.patch('alton.request_coalescer.time.time', return_value=1061):
+            self.assertEqual(coalescer.fetch('key', fetch_func), 'second')
+
+    def test_failures_not_reused(self):
+        coalescer = RequestCoalescer(window=60)
+        fetch_func = mock.Mock(side_effect=[ValueError('boom'), 'result'])
+
+        with self.assertRaises(ValueError):
+            coalescer.fetch('key', fetch_func)
+        self.assertEqual(coalescer.fetch('key', fetch_func), 'result')
+
+    def test_expired_fetches_dropped(self):
+        coalescer = RequestCoalescer(window=60)
+
+        with mock.patch('alton.request_coalescer.time.time', return_value=1000):
+            coalescer.fetch('first', lambda: 1)
+        with mock.patch('alton.request_coalescer.time.time', return_value=1061):
+            coalescer.fetch('second', lambda: 2)
+
+        self.assertEqual(list(coalescer._fetches), ['second'])  # pylint: disable=protected-access
@@ -4,12 +4,25 @@ Tests for showing AMI information.
 
 import unittest
 import mock
+from boto.exception import EC2ResponseError
+from boto.resultset import ResultSet
 from pyparsing import ParseException
-from plugins.show import Versions, ShowPlugin
+from plugins.show import AMI_CACHE_TTL, INSTANCES_PAGE_SIZE, Versions, ShowPlugin
+from alton.request_coalescer import RequestCoalescer
 
 # pylint: disable=line-too-long
 
 
+def _reservations_page(instances, next_token=None):
+    """
+    Build a fake page of DescribeInstances results.
+    """
+    page = ResultSet()
+    page.append(mock.Mock(instances=instances))
+    page.next_token = next_token
+    return page
+
+
 class TestParseCutAmi(unittest.TestCase):
     """
     Test the parsing of commands for cutting an AMI.
@@ -131,7 +144,7 @@ class TestCutFromEdp(unittest.TestCase):
         body = "cut ami verbose noop for foo-bar-baz from one-two-three using ami-deadbeef with thing=athing bang=abang"
         final_versions = Versions(
             'CONFIG REF', 'CONFIG_SECURE REF',
-            {'THING': 'athing', 'thing': 'athing', 'BANG': 'abang', 'bang': 'abang'},
+            {'thing': 'athing', 'bang': 'abang'},
             {'thing': {'url': 'THINGURL', 'shorthash': 'THINGSHORTHASH'},
              'bang': {'url': 'BANGURL', 'shorthash': 'BANGSHORTHASH'}}
         )
@@ -174,3 +187,278 @@ class TestCutFromEdp(unittest.TestCase):
             message, 'foo', 'bar', 'baz',
             mocked_get_ami_versions.return_value, False, 'ami-00000000', False
         )
+
+    @mock.patch.object(ShowPlugin, 'say')   # uses hipchat connection
+    @mock.patch.object(ShowPlugin, '__init__', return_value=None)   # uses boto
+    @mock.patch.object(ShowPlugin, '_ami_for_edp', side_effect=['ami-00000001', 'ami-00000002'])  # uses boto
+    @mock.patch.object(ShowPlugin, '_get_ami_versions', side_effect=[
+        Versions('CONFIG REF', 'SOURCE SECURE REF', {}, {}),
+        Versions('CONFIG REF', 'DEST SECURE REF', {}, {}),
+    ])
+    @mock.patch.object(ShowPlugin, '_notify_abbey')     # this is how we test the result
+    def test_cross_deployment_keeps_dest_secure_ref(self, mocked_notify_abbey, mocked_get_ami_versions, *args):  # pylint: disable=unused-argument
+        message = mock.Mock()
+        ShowPlugin().cut_from_edp(message, "cut ami for foo-bar-baz from one-two-three")
+
+        mocked_get_ami_versions.assert_has_calls([
+            mock.call('ami-00000001', message=message),
+            mock.call('ami-00000002', message=message),
+        ])
+        self.assertEqual(mocked_notify_abbey.call_args[0][4].configuration_secure, 'DEST SECURE REF')
+
+    @mock.patch.object(ShowPlugin, 'say')   # uses hipchat connection
+    @mock.patch.object(ShowPlugin, '__init__', return_value=None)   # uses boto
+    @mock.patch.object(ShowPlugin, '_ami_for_edp', return_value='ami-00000000')  # uses boto
+    @mock.patch.object(ShowPlugin, '_get_ami_versions', return_value=Versions(    # uses boto
+        'CONFIG REF', 'CONFIG_SECURE REF', {}, {}
+    ))
+    @mock.patch.object(ShowPlugin, '_notify_abbey')     # this is how we test the result
+    def test_cross_deployment_same_ami(self, mocked_notify_abbey, mocked_get_ami_versions, *args):  # pylint: disable=unused-argument
+        message = mock.Mock()
+        ShowPlugin().cut_from_edp(message, "cut ami for foo-bar-baz from one-two-three")
+
+        # The source and destination run the same AMI, so it's only looked up once.
+        mocked_get_ami_versions.assert_called_once_with('ami-00000000', message=message)
+        self.assertEqual(mocked_notify_abbey.call_args[0][4].configuration_secure, 'CONFIG_SECURE REF')
+
+
+class TestDiff(unittest.TestCase):
+    """
+    Tests for diffing EDPs and AMIs.
+    """
+    @mock.patch.object(ShowPlugin, 'say')   # uses hipchat connection
+    @mock.patch.object(ShowPlugin, '__init__', return_value=None)   # uses boto
+    @mock.patch.object(ShowPlugin, '_ami_for_edp', return_value=None)  # uses boto
+    @mock.patch.object(ShowPlugin, '_get_ami_versions')  # uses boto
+    def test_edp_without_ami(self, mocked_get_ami_versions, *args):  # pylint: disable=unused-argument
+        message = mock.Mock()
+        show_plugin = ShowPlugin()
+
+        show_plugin.diff_edps(message, 'prod', 'edx', 'edxapp', 'stage', 'edx', 'edxapp')
+        show_plugin.diff_edp_ami_id(message, 'prod', 'edx', 'edxapp', 'ami-00000001')
+        show_plugin.diff_ami_id_edp(message, 'ami-00000001', 'prod', 'edx', 'edxapp')
+
+        self.assertFalse(mocked_get_ami_versions.called)
+
+
+class TestVersions(unittest.TestCase):
+    """
+    Tests for the versions associated with an AMI.
+    """
+    def test_play_vars(self):
+        versions = Versions('CONFIG REF', 'CONFIG_SECURE REF', {'thing_version': 'athing'})
+        self.assertEqual(versions.play_vars(), {'thing_version': 'athing', 'THING_VERSION': 'athing'})
+
+
+class TestGetAmiVersions(unittest.TestCase):
+    """
+    Tests for reading the versions out of an AMI's tags.
+    """
+    @mock.patch.object(ShowPlugin, 'save')  # uses redis
+    @mock.patch.object(ShowPlugin, 'load', return_value=None)  # uses redis
+    @mock.patch.object(ShowPlugin, '_get_ami_tags', return_value={
+        'version:configuration': 'CONFIGURL abc123',
+        'version:THING': 'THINGURL def456',
+        'environment': 'prod',
+    })
+    @mock.patch.object(ShowPlugin, '__init__', return_value=None)   # uses boto
+    def test_versions_cached(self, __, mocked_get_ami_tags, mocked_load, mocked_save):
+        show_plugin = ShowPlugin()
+
+        versions = show_plugin._get_ami_versions('ami-00000001')  # pylint: disable=protected-access
+        self.assertEqual(versions.configuration, 'abc123')
+        self.assertEqual(versions.play_versions, {'thing_version': 'def456'})
+        mocked_load.assert_called_once_with('ami_versions_ami-00000001', None)
+
+        # The next lookup comes from storage without describing the AMI again.
+        mocked_load.return_value = mocked_save.call_args[0][1]
+        cached_versions = show_plugin._get_ami_versions('ami-00000001')  # pylint: disable=protected-access
+        self.assertEqual(mocked_get_ami_tags.call_count, 1)
+        self.assertEqual(
+            [cached_versions.configuration, cached_versions.configuration_secure,
+             cached_versions.play_versions, cached_versions.repos],
+            [versions.configuration, versions.configuration_secure, versions.play_versions, versions.repos]
+        )
+
+
+class TestDescribeAmis(unittest.TestCase):
+    """
+    Tests for looking up AMI tags.
+    """
+    def setUp(self):
+        super(TestDescribeAmis, self).setUp()
+        with mock.patch.object(ShowPlugin, '__init__', return_value=None):   # uses boto
+            self.show_plugin = ShowPlugin()
+        self.show_plugin._ami_cache = {}  # pylint: disable=protected-access
+
+    @staticmethod
+    def _image(ami_id):
+        """
+        Build a fake boto image.
+        """
+        return mock.Mock(id=ami_id, tags={'version:thing': 'THINGURL {}'.format(ami_id)})
+
+    @mock.patch('plugins.show.boto.connect_ec2')
+    def test_batched_and_cached(self, mocked_connect_ec2):
+        ec2 = mocked_connect_ec2.return_value
+        ec2.get_all_images.return_value = [self._image('ami-00000001'), self._image('ami-00000002')]
+
+        for __ in range(2):
+            result = self.show_plugin._describe_amis('edx', ['ami-00000001', 'ami-00000002'])  # pylint: disable=protected-access
+            self.assertEqual(result, {
+                'ami-00000001': [{'version:thing': 'THINGURL ami-00000001'}],
+                'ami-00000002': [{'version:thing': 'THINGURL ami-00000002'}],
+            })
+
+        ec2.get_all_images.assert_called_once_with(image_ids=['ami-00000001', 'ami-00000002'])
+
+    @mock.patch('plugins.show.boto.connect_ec2')
+    def test_expired_entries_dropped(self, mocked_connect_ec2):
+        ec2 = mocked_connect_ec2.return_value
+        ec2.get_all_images.side_effect = lambda image_ids: [self._image(ami_id) for ami_id in image_ids]
+
+        with mock.patch('plugins.show.time.time', return_value=1000):
+            self.show_plugin._describe_amis('edx', ['ami-00000001'])  # pylint: disable=protected-access
+        with mock.patch('plugins.show.time.time', return_value=1000 + AMI_CACHE_TTL + 1):
+            self.show_plugin._describe_amis('edx', ['ami-00000002'])  # pylint: disable=protected-access
+
+        self.assertEqual(list(self.show_plugin._ami_cache), [('edx', 'ami-00000002')])  # pylint: disable=protected-access
+
+    @mock.patch('plugins.show.boto.connect_ec2')
+    def test_unknown_ami_in_batch(self, mocked_connect_ec2):
+        def get_all_images(image_ids):
+            """
+            Fail like EC2 does when any requested AMI is unknown.
+            """
+            if 'ami-0000000f' in image_ids:
+                exc = EC2ResponseError(400, 'Bad Request')
+                exc.error_code = 'InvalidAMIID.NotFound'
+                raise exc
+            return [self._image(ami_id) for ami_id in image_ids]
+
+        mocked_connect_ec2.return_value.get_all_images.side_effect = get_all_images
+        result = self.show_plugin._describe_amis('edx', ['ami-00000001', 'ami-0000000f'])  # pylint: disable=protected-access
+
+        self.assertEqual(result, {
+            'ami-00000001': [{'version:thing': 'THINGURL ami-00000001'}],
+            'ami-0000000f': [],
+        })
+
+
+class TestInstanceElbs(unittest.TestCase):
+    """
+    Tests for looking up the ELBs an instance is registered with.
+    """
+    @mock.patch.object(ShowPlugin, '__init__', return_value=None)   # uses boto
+    def test_elb_index(self, __):
+        show_plugin = ShowPlugin()
+        first_elb = mock.Mock(instances=[mock.Mock(id='i-1'), mock.Mock(id='i-2')])
+        second_elb = mock.Mock(instances=[mock.Mock(id='i-2')])
+        elb_index = ShowPlugin._build_elb_index([first_elb, second_elb])  # pylint: disable=protected-access
+
+        # pylint: disable=protected-access
+        self.assertEqual(show_plugin._instance_elbs('i-1', elb_index=elb_index), [first_elb])
+        self.assertEqual(show_plugin._instance_elbs('i-2', elb_index=elb_index), [first_elb, second_elb])
+        self.assertEqual(show_plugin._instance_elbs('i-3', elb_index=elb_index), [])
+
+
+class TestIterInstances(unittest.TestCase):
+    """
+    Tests for paging through instances.
+    """
+    def test_follows_next_token(self):
+        ec2 = mock.Mock()
+        ec2.get_all_reservations.side_effect = [
+            _reservations_page([mock.Mock(id='i-1'), mock.Mock(id='i-2')], next_token='page-2'),
+            _reservations_page([mock.Mock(id='i-3')]),
+        ]
+        filters = {'tag:environment': 'prod'}
+
+        instances = ShowPlugin._iter_instances(ec2, filters)  # pylint: disable=protected-access
+
+        self.assertEqual([instance.id for instance in instances], ['i-1', 'i-2', 'i-3'])
+        self.assertEqual(ec2.get_all_reservations.call_args_list, [
+            mock.call(filters=filters, max_results=INSTANCES_PAGE_SIZE, next_token=None),
+            mock.call(filters=filters, max_results=INSTANCES_PAGE_SIZE, next_token='page-2'),
+        ])
+
+
+class TestShowEdp(unittest.TestCase):
+    """
+    Tests for showing the instances in an EDP.
+    """
+    @mock.patch.object(ShowPlugin, 'say')   # uses hipchat connection
+    @mock.patch.object(ShowPlugin, '__init__', return_value=None)   # uses boto
+    @mock.patch.object(ShowPlugin, '_get_amis_tags', return_value={
+        'ami-00000001': {'version:configuration': 'CONFIGURL abc123'},
+    })
+    @mock.patch('plugins.show._EDP_COALESCER', RequestCoalescer())
+    @mock.patch('plugins.show._elb')
+    @mock.patch('plugins.show._ec2')
+    def test_output_table(self, mocked_ec2, mocked_elb, mocked_get_amis_tags, __, mocked_say):
+        running = mock.Mock(id='i-1', state='running', private_dns_name='ip-10-0-0-1', image_id='ami-00000001')
+        stopped = mock.Mock(id='i-2', state='stopped', private_dns_name='ip-10-0-0-2', image_id='ami-00000002')
+        mocked_ec2.return_value.get_all_reservations.return_value = _reservations_page([running, stopped])
+        first_elb = mock.Mock(instances=[mock.Mock(id='i-1')])
+        first_elb.name = 'first-elb'
+        second_elb = mock.Mock(instances=[mock.Mock(id='i-1')])
+        second_elb.name = 'second-elb-name'
+        mocked_elb.return_value.get_all_load_balancers.return_value = [first_elb, second_elb]
+
+        message = mock.Mock()
+        show_plugin = ShowPlugin()
+        show_plugin._show_edp(message, 'prod', 'edx', 'edxapp')  # pylint: disable=protected-access
+
+        mocked_get_amis_tags.assert_called_once_with(['ami-00000001'], message=message)
+        mocked_say.assert_called_with('/code ' + '\n'.join([
+            'Internal DNS Versions             ELBs            AMI         ',
+            '------------ --------             ----            ---         ',
+            'ip-10-0-0-1  configuration=abc123 first-elb       ami-00000001',
+            '                                  second-elb-name             ',
+        ]), message)
+
+
+class TestAmiForEdp(unittest.TestCase):
+    """
+    Tests for finding the active AMI of an EDP.
+    """
+    def _ami_for_edp(self, instances):
+        """
+        Run _ami_for_edp against the given instances, all of which are behind an ELB.
+        """
+        with mock.patch.object(ShowPlugin, '__init__', return_value=None), \
+                mock.patch.object(ShowPlugin, 'say') as mocked_say, \
+                mock.patch('plugins.show._EDP_COALESCER', RequestCoalescer()), \
+                mock.patch('plugins.show._ec2') as mocked_ec2, \
+                mock.patch('plugins.show._elb') as mocked_elb:
+            mocked_ec2.return_value.get_all_reservations.return_value = _reservations_page(instances)
+            mocked_elb.return_value.get_all_load_balancers.return_value = [
+                mock.Mock(instances=[mock.Mock(id=instance.id) for instance in instances])
+            ]
+            message = mock.Mock()
+            ami = ShowPlugin()._ami_for_edp(message, 'prod', 'edx', 'edxapp')  # pylint: disable=protected-access
+            return ami, mocked_say
+
+    def test_single_ami(self):
+        ami, mocked_say = self._ami_for_edp([
+            mock.Mock(id='i-1', state='running', image_id='ami-00000001'),
+            mock.Mock(id='i-2', state='stopped', image_id='ami-00000002'),
+            mock.Mock(id='i-3', state='running', image_id='ami-00000001'),
+        ])
+        self.assertEqual(ami, 'ami-00000001')
+        self.assertFalse(mocked_say.called)
+
+    def test_multiple_amis(self):
+        ami, mocked_say = self._ami_for_edp([
+            mock.Mock(id='i-1', state='running', image_id='ami-00000001'),
+            mock.Mock(id='i-2', state='running', image_id='ami-00000002'),
+        ])
+        self.assertIsNone(ami)
+        self.assertIn('Multiple AMIs found', mocked_say.call_args[0][0])
+
+    def test_no_amis(self):
+        ami, mocked_say = self._ami_for_edp([
+            mock.Mock(id='i-1', state='stopped', image_id='ami-00000001'),
+        ])
+        self.assertIsNone(ami)
+        self.assertIn('No AMIs found', mocked_say.call_args[0][0])